@@ -5,6 +5,7 @@
 
 
 from .api import OkexApi
-from .client import OkexClient
+from .async_api import AsyncOkexApi
+from .client import AsyncOkexClient, OkexClient
 from .ws import OkexWebsocketsApi
 from .wsclient import OkexWebsocketsClient
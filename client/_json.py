@@ -0,0 +1,41 @@
+# _json.py
+# Copyright (C) 2021 Ben Tilley <targansaikhan@gmail.com>
+#
+# Distributed under terms of the MIT license.
+
+"""JSON helpers that use orjson when it is installed.
+
+Both encoders produce the same compact, ASCII-only output with no whitespace,
+which is the form OKEX expects in the signature prehash.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# orjson.JSONDecodeError subclasses this, so it covers both decoders.
+JSONDecodeError = json.JSONDecodeError
+
+
+if orjson is not None:
+
+    def dumps(obj) -> str:
+        s = orjson.dumps(obj).decode("utf-8")
+        # orjson cannot escape non-ASCII characters, leave those rare bodies
+        # to the stdlib encoder so they match it byte for byte
+        if not s.isascii():
+            return json.dumps(obj, separators=(",", ":"))
+        return s
+
+    loads = orjson.loads
+
+else:  # pragma: no cover
+
+    def dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    loads = json.loads
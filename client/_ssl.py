@@ -0,0 +1,39 @@
+# _ssl.py
+# Copyright (C) 2021 Ben Tilley <targansaikhan@gmail.com>
+#
+# Distributed under terms of the MIT license.
+
+"""The TLS contexts shared by the package's HTTP and websocket connections.
+
+Building a context loads and parses the whole CA bundle, so one context is
+created on first use and reused by every client and connection.
+
+httpx gets a context of its own: httpcore sets the ALPN protocols on the
+context it is given to offer h2, which the aiohttp and websockets connections
+cannot speak. Their context pins ALPN to HTTP/1.1.
+"""
+
+import ssl
+from functools import cache
+
+
+@cache
+def get_ssl_context(http2: bool = False) -> ssl.SSLContext:
+    """Get the shared, verifying TLS context.
+
+    Args:
+        http2: Get the context for httpx, which may negotiate HTTP/2, instead
+            of the HTTP/1.1 only context.
+    """
+    # certifi is the CA bundle httpx, aiohttp and requests verify against by
+    # default, fall back to the system store without it
+    try:
+        import certifi
+    except ImportError:  # pragma: no cover
+        cafile = None
+    else:
+        cafile = certifi.where()
+    context = ssl.create_default_context(cafile=cafile)
+    if not http2:
+        context.set_alpn_protocols(["http/1.1"])
+    return context
@@ -6,18 +6,158 @@
 
 import os
 import base64
-from datetime import datetime
-import hmac
 import hashlib
-import json
 import logging
-import requests
-from typing import Dict, List, Optional
-
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from . import _json
+from ._ssl import get_ssl_context
 from .query_params import QueryParams
 
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
 logger = logging.getLogger(__name__)
 
+TRANSPORTS = ("requests", "httpx")
+HMAC_BACKENDS = ("hashlib", "cryptography")
+
+# Connection pool sizing of the requests transport. POOL_MAXSIZE bounds how
+# many requests batch_get and get_many can usefully have in flight.
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 32
+
+# Connection pool limits of the httpx transports. Idle connections are kept
+# open long enough to be reused between polls of the same endpoints.
+HTTPX_MAX_CONNECTIONS = 100
+HTTPX_MAX_KEEPALIVE_CONNECTIONS = 40
+HTTPX_KEEPALIVE_EXPIRY = 30.0
+
+# Size of the reads made from streamed response bodies, see OkexApi.iter_get.
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Query parameters shared by all of the candlestick endpoints.
+CANDLESTICK_PARAMS = ("instId", "before", "after", "bar", "limit")
+
+# The request path and query parameter names of each GET endpoint, keyed by
+# the OkexApi method that wraps it. Each method passes its arguments to
+# OkexApi._get_endpoint in the same order as the parameter names here.
+ENDPOINTS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "get_account_and_position_risk": (
+        "/api/v5/account/account-position-risk",
+        ("instType",),
+    ),
+    "get_account_balance": ("/api/v5/account/balance", ("ccy",)),
+    "get_positions": ("/api/v5/account/positions", ("instType", "instId", "posId")),
+    "get_bills_details": (
+        "/api/v5/account/bills",
+        (
+            "instType",
+            "ccy",
+            "mgnMode",
+            "ctType",
+            "type",
+            "subType",
+            "after",
+            "before",
+            "limit",
+        ),
+    ),
+    "get_tickers": ("/api/v5/market/tickers", ("instType", "uly")),
+    "get_ticker": ("/api/v5/market/ticker", ("instId",)),
+    "get_index_tickers": ("/api/v5/market/index-tickers", ("quoteCcy", "instId")),
+    "get_order_book": ("/api/v5/market/books", ("instId", "sz")),
+    "get_candlesticks": ("/api/v5/market/candles", CANDLESTICK_PARAMS),
+    "get_candlesticks_history": ("/api/v5/market/history-candles", CANDLESTICK_PARAMS),
+    "get_index_candlesticks": ("/api/v5/market/index-candles", CANDLESTICK_PARAMS),
+    "get_mark_price_candlesticks": (
+        "/api/v5/market/mark-price-candles",
+        CANDLESTICK_PARAMS,
+    ),
+    "get_trades": ("/api/v5/market/trades", ("instId", "limit")),
+    "get_total_volume": ("/api/v5/market/platform-24-volume", ()),
+    "get_oracle": ("/api/v5/market/oracle", ()),
+}
+
+# Bound once so the signing hot path resolves them as plain globals rather
+# than module attribute lookups on every request.
+_b64encode = base64.b64encode
+_gmtime = time.gmtime
+_time_ns = time.time_ns
+
+# hashlib.sha256 is OpenSSL's implementation (and so can use the CPU's SHA
+# extensions) unless Python was built without OpenSSL.
+SHA256_BACKEND = "openssl" if hashlib.sha256.__module__ == "_hashlib" else "builtin"
+
+# HMAC pads, RFC 2104.
+_SHA256_BLOCK_SIZE = 64
+_IPAD = bytes(x ^ 0x36 for x in range(256))
+_OPAD = bytes(x ^ 0x5C for x in range(256))
+
+
+def hashlib_signer(key: bytes) -> Callable[[bytes], bytes]:
+    """Create an HMAC-SHA256 function for a fixed key using the stdlib.
+
+    HMAC is computed by hand from two SHA-256 states that have already
+    absorbed the padded key, which are copied for every signature. This
+    skips the dispatch that hmac.HMAC goes through on every copy and digest.
+
+    Args:
+        key: The secret key to sign messages with.
+    """
+    if len(key) > _SHA256_BLOCK_SIZE:
+        key = hashlib.sha256(key).digest()
+    key = key.ljust(_SHA256_BLOCK_SIZE, b"\0")
+    inner_template = hashlib.sha256(key.translate(_IPAD))
+    outer_template = hashlib.sha256(key.translate(_OPAD))
+
+    def sign(msg: bytes) -> bytes:
+        inner = inner_template.copy()
+        inner.update(msg)
+        outer = outer_template.copy()
+        outer.update(inner.digest())
+        return outer.digest()
+
+    return sign
+
+
+def cryptography_signer(key: bytes) -> Callable[[bytes], bytes]:
+    """Create an HMAC-SHA256 function for a fixed key using cryptography.
+
+    Copying a keyed cryptography HMAC context duplicates the underlying
+    OpenSSL context directly, which is cheaper than the stdlib hmac wrapper.
+
+    Args:
+        key: The secret key to sign messages with.
+    """
+    from cryptography.hazmat.primitives import hashes, hmac
+
+    template = hmac.HMAC(key, hashes.SHA256())
+
+    def sign(msg: bytes) -> bytes:
+        h = template.copy()
+        h.update(msg)
+        return h.finalize()
+
+    return sign
+
+
+@cache
+def _import_requests():
+    # requests (and urllib3 under it) is one of the slowest imports of the
+    # package, so it is only imported once a requests transport is created.
+    # The optional backends (httpx, cryptography, ijson) are likewise only
+    # imported by the methods that use them.
+    import requests
+    import requests.adapters
+
+    return requests
+
 
 class OkexApi:
     """API client for the OKEX crypto trading platform.
@@ -35,6 +175,12 @@ class OkexApi:
         passphrase: The passphrase that you gave the API key.
         secretkey: The secret key that was generated when you created the API key.
         base_url: The domain of the OKEX API.
+        transport: HTTP library used to talk to the API, "requests" or "httpx".
+            The "httpx" transport uses HTTP/2 so that concurrent requests share
+            a single connection; it needs the optional httpx[http2] dependency.
+        hmac_backend: Library used to sign requests, "hashlib" or
+            "cryptography". The "cryptography" backend is faster but needs the
+            optional cryptography dependency.
     """
 
     def __init__(
@@ -43,6 +189,8 @@ class OkexApi:
         passphrase: Optional[str] = os.getenv("OKEX_PASSPHRASE"),
         secretkey: Optional[str] = os.getenv("OKEX_SECRET_KEY"),
         base_url: str = "www.okex.com",
+        transport: str = "requests",
+        hmac_backend: str = "hashlib",
     ):
         if secretkey is None:
             logger.warning("Client does not have a secret key")
@@ -51,33 +199,108 @@ class OkexApi:
             raise ValueError("OkexClient must have an api_key")
         if passphrase is None:
             raise ValueError("OkexClient must have a passphrase")
+        if hmac_backend not in HMAC_BACKENDS:
+            raise ValueError(f"hmac_backend must be one of {HMAC_BACKENDS}")
 
         self.api_key = api_key
         self.passphrase = passphrase
         self.secretkey = secretkey
         self.base_url = base_url
         self.protocol = "https"
+        self._url_prefix = f"{self.protocol}://{self.base_url}"
+
+        self._sign: Optional[Callable[[bytes], bytes]] = None
+        self._headers_template: Dict[str, str] = {}
+        if secretkey is not None:
+            self._sign = self._create_signer(secretkey.encode("ascii"), hmac_backend)
+            self._headers_template = {
+                "OK-ACCESS-KEY": api_key,
+                "OK-ACCESS-PASSPHRASE": passphrase,
+            }
+
+        self._create_transport(transport)
         logger.info("OKEX Client Initialised")
 
-    def compile_url(self, request_path: str) -> str:
-        """Create a full URI from a request path.
+    def _create_transport(self, transport: str):
+        if transport not in TRANSPORTS:
+            raise ValueError(f"transport must be one of {TRANSPORTS}")
 
-        Args:
-            request_path: The path of the request URL.
-        """
-        return f"{self.protocol}://{self.base_url}{request_path}"
+        # Persistent clients keep the TCP/TLS connection to the API alive
+        # between requests, instead of paying for a new handshake every call.
+        self._session: Optional["requests.Session"] = None
+        self._client: Optional["httpx.Client"] = None
+        if transport == "httpx":
+            self._client = self._create_httpx_client()
+        if self._client is None:
+            self._session = self._create_session()
 
     @staticmethod
-    def compile_query_string(query_params: Dict[str, str]) -> str:
-        """Compile a query string from a dictionary of parameters.
+    def _create_signer(key: bytes, hmac_backend: str) -> Callable[[bytes], bytes]:
+        if hmac_backend == "cryptography":
+            try:
+                sign = cryptography_signer(key)
+            except ImportError:  # pragma: no cover
+                logger.warning("cryptography is not installed, falling back to hashlib")
+            else:
+                logger.info("Signing requests with cryptography HMAC-SHA256")
+                return sign
+        logger.info("Signing requests with hashlib HMAC-SHA256 (%s)", SHA256_BACKEND)
+        if SHA256_BACKEND != "openssl":
+            logger.warning("hashlib is not backed by OpenSSL, signing will be slow")
+        return hashlib_signer(key)
+
+    def _create_session(self) -> "requests.Session":
+        requests = _import_requests()
+        session = requests.Session()
+        session.mount(
+            f"{self.protocol}://",
+            requests.adapters.HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE
+            ),
+        )
+        session.headers.update(self._headers_template)
+        return session
+
+    def _create_httpx_client(self) -> Optional["httpx.Client"]:
+        try:
+            import httpx
+        except ImportError:  # pragma: no cover
+            logger.warning("httpx is not installed, falling back to requests")
+            return None
+        try:
+            return httpx.Client(
+                http2=True,
+                verify=get_ssl_context(http2=True),
+                base_url=self._url_prefix,
+                headers=self._headers_template,
+                limits=self._httpx_limits(),
+            )
+        except ImportError:
+            logger.warning("h2 is not installed, falling back to requests")
+            return None
 
-        Args:
-            query_params: Query string parameters.
-        """
-        query_string = "?"
-        for i, (k, v) in enumerate(query_params.items()):
-            query_string += f"{'&' if i > 0 else ''}{k}={v}"
-        return query_string
+    @staticmethod
+    def _httpx_limits() -> "httpx.Limits":
+        import httpx
+
+        return httpx.Limits(
+            max_connections=HTTPX_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTPX_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTPX_KEEPALIVE_EXPIRY,
+        )
+
+    def __enter__(self) -> "OkexApi":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections."""
+        if self._client is not None:
+            self._client.close()
+        if self._session is not None:
+            self._session.close()
 
     @staticmethod
     def get_timestamp() -> str:
@@ -86,11 +309,20 @@ class OkexApi:
         The OKEX formatting requires only 3 digits in the microseconds
         position. And for the timestamp to be terminated with a 'Z'.
         """
-        return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        seconds, nanoseconds = divmod(_time_ns(), 1_000_000_000)
+        t = _gmtime(seconds)
+        return "%04d-%02d-%02dT%02d:%02d:%02d.%03dZ" % (
+            t.tm_year,
+            t.tm_mon,
+            t.tm_mday,
+            t.tm_hour,
+            t.tm_min,
+            t.tm_sec,
+            nanoseconds // 1_000_000,
+        )
 
-    @staticmethod
     def get_signature(
-        secretkey: str, time_stamp: str, method: str, request_path: str, body: str
+        self, time_stamp: str, method: str, request_path: str, body: str
     ) -> str:
         """Get the signature hash to sign the request.
 
@@ -99,18 +331,17 @@ class OkexApi:
 
         Args:
             time_stamp: Time stamp of when the request is being made.
-            method: The HTTP method e.g. "GET", "POST", etc.
+            method: The upper case HTTP method e.g. "GET", "POST", etc.
             request_path: The path of the request URL.
             body: The stringified body of the request with no whitespace.
         """
-        prehash = time_stamp + method.upper() + request_path + body
-        logger.debug(f"Computing signature from prehash: {prehash}")
+        if self._sign is None:
+            raise ValueError("A secret key is required to sign requests")
+
+        prehash = (time_stamp + method + request_path + body).encode("ascii")
+        logger.debug("Computing signature from prehash: %s", prehash)
 
-        h = hmac.new(
-            bytes(secretkey, "ascii"), bytes(prehash, "ascii"), hashlib.sha256
-        ).digest()
-        base64_encoded = base64.b64encode(h).decode("ascii")
-        return base64_encoded
+        return _b64encode(self._sign(prehash)).decode("ascii")
 
     def get_headers(self, method: str, request_path: str, body: str) -> Dict[str, str]:
         """Get the required headers for a request.
@@ -120,20 +351,26 @@ class OkexApi:
             request_path: The path of the request URL.
             body: The stringified body of the request with no whitespace.
         """
-        if self.secretkey is None:
+        return {
+            **self._headers_template,
+            **self._get_signed_headers(method, request_path, body),
+        }
+
+    def _get_signed_headers(
+        self, method: str, request_path: str, body: str
+    ) -> Dict[str, str]:
+        # The static key and passphrase headers are set once on the HTTP
+        # client, so only the per-request headers are built here.
+        if self._sign is None:
             return {}
 
         time_stamp = self.get_timestamp()
-        signature = self.get_signature(
-            self.secretkey, time_stamp, method, request_path, body
-        )
-        headers = {
-            "OK-ACCESS-KEY": self.api_key,
-            "OK-ACCESS-SIGN": signature,
+        return {
+            "OK-ACCESS-SIGN": self.get_signature(
+                time_stamp, method, request_path, body
+            ),
             "OK-ACCESS-TIMESTAMP": time_stamp,
-            "OK-ACCESS-PASSPHRASE": self.passphrase,
         }
-        return headers
 
     def make_request(
         self,
@@ -153,17 +390,81 @@ class OkexApi:
             query_params: Query string parameters.
             params: Remaining kwargs make up the request body.
         """
-        body = json.dumps(params, separators=(",", ":")) if params else ""
-        _method = getattr(requests, method.lower())
+        method = method.upper()
+        body = _json.dumps(params) if params else ""
+        return self._parse_response(
+            self._send(method, request_path, query_params, body)
+        )
 
-        if query_params:
-            request_path += self.compile_query_string(query_params)
+    def _send(
+        self,
+        method: str,
+        request_path: str,
+        query_params: Optional[Dict[str, str]],
+        body: str,
+        stream: bool = False,
+    ):
+        """Sign and send a request with whichever HTTP client is in use."""
+        if self._client is not None:
+            request = self._build_httpx_request(
+                method, request_path, query_params, body
+            )
+            return self._client.send(request, stream=stream)
+
+        # Sign the path of the prepared request, so that the signature covers
+        # exactly the URL that requests will send.
+        prepared = self._session.prepare_request(
+            _import_requests().Request(
+                method,
+                self._url_prefix + request_path,
+                params=query_params,
+                data=body or None,
+            )
+        )
+        prepared.headers.update(
+            self._get_signed_headers(method, prepared.path_url, body)
+        )
+        settings = self._session.merge_environment_settings(
+            prepared.url, {}, stream, None, None
+        )
+        return self._session.send(prepared, **settings)
 
-        response = _method(
-            self.compile_url(request_path),
-            headers=self.get_headers(method, request_path, body),
+    def _build_httpx_request(
+        self,
+        method: str,
+        request_path: str,
+        query_params: Optional[Dict[str, str]],
+        body: str,
+    ) -> "httpx.Request":
+        # Let httpx build the canonical URL and sign exactly what it sends.
+        request = self._client.build_request(
+            method, request_path, params=query_params, content=body or None
         )
-        return response.json()
+        signed_path = request.url.raw_path.decode("ascii")
+        request.headers.update(self._get_signed_headers(method, signed_path, body))
+        return request
+
+    @staticmethod
+    def _encode_query_params(query_params: Dict[str, str]) -> str:
+        # urlencode's defaults are the encoding requests and httpx use, so every
+        # transport sends the same query string
+        return "?" + urlencode(query_params, doseq=True)
+
+    @classmethod
+    def _parse_response(cls, response) -> Dict:
+        return cls._decode_response(response.content, response.status_code)
+
+    @staticmethod
+    def _decode_response(content: bytes, status_code: int) -> Dict:
+        # Decoding the raw bytes skips the charset detection that the HTTP
+        # libraries run before parsing ``.json()``.
+        if not content:
+            return {}
+        try:
+            return _json.loads(content)
+        except _json.JSONDecodeError:
+            logger.warning("Could not decode %s response: %r", status_code, content)
+            return {"_raw": content, "_status": status_code}
 
     def get(
         self, request_path: str, query_params: Optional[Dict[str, str]] = None
@@ -171,6 +472,103 @@ class OkexApi:
         """Perform a GET request."""
         return self.make_request("GET", request_path, query_params=query_params)
 
+    def iter_get(
+        self, request_path: str, query_params: Optional[Dict[str, str]] = None
+    ) -> Iterator[Any]:
+        """Perform a GET request and stream the records in its data array.
+
+        Records are parsed and yielded as the response body arrives, so the
+        whole response is never held in memory and iteration can stop early.
+        This needs the optional ijson dependency.
+        """
+        try:
+            import ijson
+        except ImportError:  # pragma: no cover
+            raise ImportError("iter_get requires the ijson package") from None
+
+        response = self._send("GET", request_path, query_params, "", stream=True)
+        try:
+            if self._client is not None:
+                chunks = response.iter_bytes()
+            else:
+                chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+            records = ijson.sendable_list()
+            parser = ijson.items_coro(records, "data.item")
+            for chunk in chunks:
+                parser.send(chunk)
+                yield from records
+                del records[:]
+            parser.close()
+            yield from records
+        finally:
+            response.close()
+
+    def _get_endpoint(self, name: str, values: Tuple[Any, ...]) -> Dict:
+        """GET an endpoint from its (possibly unset) query parameters.
+
+        Args:
+            name: The name of the endpoint's method in ``ENDPOINTS``.
+            values: The parameter values, in the same order as the endpoint's
+                query parameter names.
+        """
+        return self.get(*self._endpoint_request(name, values))
+
+    @staticmethod
+    def _endpoint_request(
+        name: str, values: Tuple[Any, ...]
+    ) -> Tuple[str, Optional[QueryParams]]:
+        request_path, keys = ENDPOINTS[name]
+        params = {k: v for k, v in zip(keys, values) if v is not None}
+        if not params:
+            return request_path, None
+        return request_path, QueryParams(**params)
+
+    def batch_get(
+        self,
+        paths_and_params: List[Tuple[str, Optional[Dict[str, str]]]],
+        max_workers: int = 10,
+    ) -> List[Dict]:
+        """Perform several GET requests concurrently.
+
+        The requests are spread over a thread pool that shares the client's
+        connection pool, so ``max_workers`` should not exceed POOL_MAXSIZE.
+        Each request is timestamped and signed in its own worker, just before
+        it is sent, to stay within the OKEX timestamp window.
+
+        Args:
+            paths_and_params: (request_path, query_params) pairs to fetch.
+            max_workers: Maximum number of requests in flight at once.
+
+        Returns:
+            The responses, in the same order as ``paths_and_params``.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda args: self.get(*args), paths_and_params))
+
+    def get_many(
+        self, calls: List[Tuple[str, Dict[str, Any]]], max_workers: int = 8
+    ) -> List[Any]:
+        """Call several endpoint methods concurrently.
+
+        This is `batch_get` for the endpoint methods, e.g. to fetch the
+        candlesticks of several instruments at once:
+
+            api.get_many(
+                [("get_candlesticks", {"instrument_id": i}) for i in instruments]
+            )
+
+        Args:
+            calls: (method name, keyword arguments) pairs to call.
+            max_workers: Maximum number of requests in flight at once.
+
+        Returns:
+            The results of the calls, in the same order as ``calls``.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(lambda call: getattr(self, call[0])(**call[1]), calls)
+            )
+
     ####################
     # Account Endpoints#
     ####################
@@ -181,8 +579,7 @@ class OkexApi:
         Args:
             instrument_type: Instrument type ("MARGIN", "SWAP", "FUTURES", "OPTION")
         """
-        q = QueryParams(instType=instrument_type)
-        return self.get("/api/v5/account/account-position-risk", query_params=q)
+        return self._get_endpoint("get_account_and_position_risk", (instrument_type,))
 
     def get_account_balance(self, currencies: Optional[List[str]] = None) -> Dict:
         """Get summary of account balance for different currencies.
@@ -193,8 +590,7 @@ class OkexApi:
         Args:
             currencies: Currencies to fetch balance for.
         """
-        q = QueryParams(ccy=currencies)
-        return self.get("/api/v5/account/balance", query_params=q)
+        return self._get_endpoint("get_account_balance", (currencies,))
 
     def get_positions(
         self,
@@ -213,10 +609,9 @@ class OkexApi:
             instrument_id: Instrument ID, e.g. "BTC-USDT"
             position_ids: Position IDs (no more than 20)
         """
-        q = QueryParams(
-            instType=instrument_type, instId=instrument_id, posId=position_ids
+        return self._get_endpoint(
+            "get_positions", (instrument_type, instrument_id, position_ids)
         )
-        return self.get("/api/v5/account/positions", query_params=q)
 
     def get_bills_details(
         self,
@@ -301,18 +696,20 @@ class OkexApi:
                 173: Funding fee expense
                 174: Funding fee income
         """
-        q = QueryParams(
-            instType=instrument_type,
-            ccy=currency,
-            mgnMode=margin_mode,
-            ctType=contract_type,
-            type=bill_type,
-            subType=bill_subtype,
-            after=after,
-            before=before,
-            limit=limit,
+        return self._get_endpoint(
+            "get_bills_details",
+            (
+                instrument_type,
+                currency,
+                margin_mode,
+                contract_type,
+                bill_type,
+                bill_subtype,
+                after,
+                before,
+                limit,
+            ),
         )
-        return self.get("/api/v5/account/bills", query_params=q)
 
     # def get_bills_details_archive(self, instrument_type: str):
     #     q = QueryParams(instType=instrument_type, uly=underlying)
@@ -377,8 +774,7 @@ class OkexApi:
             instrument_type: Instrument type ("SPOT", "SWAP", "FUTURES", "OPTION")
             underlying: Underlying asset, e.g. "BTC-USDT"; only for FUTURES/SWAP/OPTION
         """
-        q = QueryParams(instType=instrument_type, uly=underlying)
-        return self.get("/api/v5/market/tickers", query_params=q)
+        return self._get_endpoint("get_tickers", (instrument_type, underlying))
 
     def get_ticker(self, instrument_id: Optional[str] = None) -> Dict:
         """Get summary information for a specific ticker.
@@ -388,8 +784,7 @@ class OkexApi:
         Args:
             instrument_id: Instrument ID, e.g. "BTC-USDT-SWAP"
         """
-        q = QueryParams(instId=instrument_id)
-        return self.get("/api/v5/market/ticker", query_params=q)
+        return self._get_endpoint("get_ticker", (instrument_id,))
 
     def get_index_tickers(
         self, quote_currency: Optional[str] = None, instrument_id: Optional[str] = None
@@ -402,8 +797,7 @@ class OkexApi:
         """
         if quote_currency is None and instrument_id is None:
             raise TypeError("You must define one of quote_currency or instrument_id")
-        q = QueryParams(quoteCcy=quote_currency, instId=instrument_id)
-        return self.get("/api/v5/market/index-tickers", query_params=q)
+        return self._get_endpoint("get_index_tickers", (quote_currency, instrument_id))
 
     def get_order_book(self, instrument_id: Optional[str] = None, book_depth: int = 1):
         """Retrieve a instrument's order book.
@@ -412,8 +806,7 @@ class OkexApi:
             instrument_id: Instrument ID, e.g. "BTC-USDT"
             book_depth: Order book depth per side. Maximum 400, e.g. 400 bids + 400 asks
         """
-        q = QueryParams(instId=instrument_id, sz=book_depth)
-        return self.get("/api/v5/market/books", query_params=q)
+        return self._get_endpoint("get_order_book", (instrument_id, book_depth))
 
     def get_candlesticks(
         self,
@@ -435,14 +828,29 @@ class OkexApi:
             candle_size: Bar size, the default is "1m" e.g. "1m" "1H" "1D" "1W" "3M"
             limit: Number of results per request. Maximum 100; Default 100.
         """
-        q = QueryParams(
-            instId=instrument_id,
-            before=before,
-            after=after,
-            bar=candle_size,
-            limit=limit,
+        return self._get_endpoint(
+            "get_candlesticks", (instrument_id, before, after, candle_size, limit)
+        )
+
+    def get_candlesticks_iter(
+        self,
+        instrument_id: Optional[str] = None,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        candle_size: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[List[str]]:
+        """Stream the candlestick charts one candle at a time.
+
+        This takes the same arguments as `get_candlesticks`, but yields each
+        candle as it is parsed from the response instead of returning the
+        whole response. See `iter_get`.
+        """
+        return self.iter_get(
+            *self._endpoint_request(
+                "get_candlesticks", (instrument_id, before, after, candle_size, limit)
+            )
         )
-        return self.get("/api/v5/market/candles", query_params=q)
 
     def get_candlesticks_history(
         self,
@@ -461,14 +869,10 @@ class OkexApi:
             candle_size: Bar size, the default is "1m" e.g. "1m" "1H" "1D" "1W" "3M"
             limit: Number of results per request. Maximum 100; Default 100.
         """
-        q = QueryParams(
-            instId=instrument_id,
-            before=before,
-            after=after,
-            bar=candle_size,
-            limit=limit,
+        return self._get_endpoint(
+            "get_candlesticks_history",
+            (instrument_id, before, after, candle_size, limit),
         )
-        return self.get("/api/v5/market/history-candles", query_params=q)
 
     def get_index_candlesticks(
         self,
@@ -490,14 +894,9 @@ class OkexApi:
             candle_size: Bar size, the default is "1m" e.g. "1m" "1H" "1D" "1W" "3M"
             limit: Number of results per request. Maximum 100; Default 100.
         """
-        q = QueryParams(
-            instId=instrument_id,
-            before=before,
-            after=after,
-            bar=candle_size,
-            limit=limit,
+        return self._get_endpoint(
+            "get_index_candlesticks", (instrument_id, before, after, candle_size, limit)
         )
-        return self.get("/api/v5/market/index-candles", query_params=q)
 
     def get_mark_price_candlesticks(
         self,
@@ -519,14 +918,10 @@ class OkexApi:
             candle_size: Bar size, the default is "1m" e.g. "1m" "1H" "1D" "1W" "3M"
             limit: Number of results per request. Maximum 100; Default 100.
         """
-        q = QueryParams(
-            instId=instrument_id,
-            before=before,
-            after=after,
-            bar=candle_size,
-            limit=limit,
+        return self._get_endpoint(
+            "get_mark_price_candlesticks",
+            (instrument_id, before, after, candle_size, limit),
         )
-        return self.get("/api/v5/market/mark-price-candles", query_params=q)
 
     def get_trades(
         self, instrument_id: Optional[str] = None, limit: Optional[int] = None
@@ -537,8 +932,7 @@ class OkexApi:
             instrument_id: Instrument ID, e.g. "BTC-USDT"
             limit: Number of results per request. Maximum 100; Default 100.
         """
-        q = QueryParams(instId=instrument_id, limit=limit)
-        return self.get("/api/v5/market/trades", query_params=q)
+        return self._get_endpoint("get_trades", (instrument_id, limit))
 
     def get_total_volume(self):
         """The 24-hour trading volume of the platform.
@@ -546,11 +940,11 @@ class OkexApi:
         The 24-hour trading volume is calculated on a rolling basis, using USD
         as the pricing unit.
         """
-        return self.get("/api/v5/market/platform-24-volume")
+        return self._get_endpoint("get_total_volume", ())
 
     def get_oracle(self):
         """Cryptographically signed prices available to be posted on-chain
 
         Using the Open Oracle standard.
         """
-        return self.get("/api/v5/market/oracle")
+        return self._get_endpoint("get_oracle", ())
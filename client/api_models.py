@@ -4,10 +4,15 @@
 # Distributed under terms of the MIT license.
 
 
-from datetime import datetime
-from functools import cached_property
-from typing import Any, Dict, List
-from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import cache
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Sequence, overload
+from dataclasses import dataclass, fields
+
+from . import _json
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class ModelTimestampMixin:
@@ -17,15 +22,20 @@ class ModelTimestampMixin:
     that to get the number of seconds we need to be dividing by 1000.
     """
 
-    _timestamp: str
+    __slots__ = ()
 
-    @cached_property
+    _timestamp: int
+
+    @property
     def timestamp(self) -> datetime:
-        # timestamp is in milliseconds -> divide by 1000 to get seconds
-        return datetime.fromtimestamp(float(self._timestamp) / 1000)
+        # split the milliseconds with integer arithmetic, no float round trip
+        ts = self._timestamp
+        return datetime.fromtimestamp(ts // 1000, tz=timezone.utc).replace(
+            microsecond=(ts % 1000) * 1000
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class CandleStick(ModelTimestampMixin):
     """Simple wrapper for candlestick data.
 
@@ -41,7 +51,7 @@ class CandleStick(ModelTimestampMixin):
         volumne_in_currency: volatility of the period in currency
     """
 
-    _timestamp: str
+    _timestamp: int
     open: float
     high: float
     low: float
@@ -51,27 +61,144 @@ class CandleStick(ModelTimestampMixin):
 
     @staticmethod
     def from_api_data(api_data: List[str]) -> "CandleStick":
-        [ts, o, h, l, c, vol, vol_currency] = api_data
-        return CandleStick(
-            _timestamp=ts,
-            open=float(o),
-            high=float(h),
-            low=float(l),
-            close=float(c),
-            volume=float(vol),
-            volume_in_currency=float(vol_currency),
-        )
+        # map casts the six numeric columns in one C loop
+        o, h, l, c, vol, vol_currency = map(float, api_data[1:])
+        return CandleStick(int(api_data[0]), o, h, l, c, vol, vol_currency)
+
+    @staticmethod
+    def from_api_data_bulk(api_data: List[List[str]]) -> "CandleStickBatch":
+        return CandleStickBatch.from_api_data(api_data)
 
-    @cached_property
+    @property
     def change(self):
         return round(self.close - self.open, 2)
 
-    @cached_property
+    @property
     def spread(self):
         return round(self.high - self.low, 2)
 
 
-@dataclass
+@dataclass(eq=False)
+class CandleStickBatch(Sequence[CandleStick]):
+    """Column-oriented wrapper for a batch of candlestick data.
+
+    Each field holds one column of the batch as a NumPy array, so that the
+    whole batch is parsed with a handful of vectorised casts and can be
+    analysed without looping in Python. Indexing or iterating the batch
+    still gives `CandleStick` objects, built on demand.
+
+    Args:
+        timestamps: Start times of the periods (datetime64[ms], UTC)
+        open: open prices of the periods
+        high: high prices of the periods
+        low: low prices of the periods
+        close: close prices of the periods
+        volume: volatility of the periods in contracts
+        volume_in_currency: volatility of the periods in currency
+    """
+
+    timestamps: "np.ndarray"
+    open: "np.ndarray"
+    high: "np.ndarray"
+    low: "np.ndarray"
+    close: "np.ndarray"
+    volume: "np.ndarray"
+    volume_in_currency: "np.ndarray"
+
+    @staticmethod
+    def from_api_data(api_data: List[List[str]]) -> "CandleStickBatch":
+        # numpy is imported on first use, so importing the package stays fast
+        import numpy as np
+
+        if not api_data:
+            rows = np.empty((0, 7), dtype=object)
+        else:
+            rows = np.array(api_data, dtype=object)
+            if rows.ndim != 2 or rows.shape[1] != 7:
+                raise ValueError("Expected candlestick data rows of 7 columns")
+        ts = rows[:, 0].astype(np.int64).view("datetime64[ms]")
+        o, h, l, c, vol, vol_currency = rows[:, 1:].astype(np.float64).T
+        return CandleStickBatch(
+            timestamps=ts,
+            open=o,
+            high=h,
+            low=l,
+            close=c,
+            volume=vol,
+            volume_in_currency=vol_currency,
+        )
+
+    @staticmethod
+    def concatenate(batches: Sequence["CandleStickBatch"]) -> "CandleStickBatch":
+        import numpy as np
+
+        if not batches:
+            return CandleStickBatch.from_api_data([])
+        return CandleStickBatch(
+            *(
+                np.concatenate([getattr(batch, f.name) for batch in batches])
+                for f in fields(CandleStickBatch)
+            )
+        )
+
+    def between(self, start: int, end: int) -> "CandleStickBatch":
+        """Get the candlesticks that start in a time range.
+
+        Args:
+            start: Start of the range, in Unix milliseconds (inclusive)
+            end: End of the range, in Unix milliseconds (exclusive)
+        """
+        ts = self.timestamps.view("int64")
+        mask = (start <= ts) & (ts < end)
+        return CandleStickBatch(
+            *(getattr(self, f.name)[mask] for f in fields(CandleStickBatch))
+        )
+
+    def to_records(self) -> List[CandleStick]:
+        return list(self)
+
+    @property
+    def change(self) -> "np.ndarray":
+        return (self.close - self.open).round(2)
+
+    @property
+    def spread(self) -> "np.ndarray":
+        return (self.high - self.low).round(2)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @overload
+    def __getitem__(self, i: int) -> CandleStick: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[CandleStick]: ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return CandleStick(
+            _timestamp=int(self.timestamps[i].astype("int64")),
+            open=float(self.open[i]),
+            high=float(self.high[i]),
+            low=float(self.low[i]),
+            close=float(self.close[i]),
+            volume=float(self.volume[i]),
+            volume_in_currency=float(self.volume_in_currency[i]),
+        )
+
+    def __iter__(self) -> Iterator[CandleStick]:
+        return (self[i] for i in range(len(self)))
+
+
+def _single_data_item(data: List[Any]) -> Any:
+    """Get the only item in the data array of a websocket message."""
+    if len(data) > 1:
+        raise ValueError("More data in websocket message than expected")
+    return data[0]
+
+
+@dataclass(slots=True)
 class Trade(ModelTimestampMixin):
     """Simple wrapper for trade data.
 
@@ -86,7 +213,7 @@ class Trade(ModelTimestampMixin):
         trade_id: Unique ID for the trade
     """
 
-    _timestamp: str
+    _timestamp: int
     instrument_id: str
     price: float
     side: str
@@ -95,17 +222,55 @@ class Trade(ModelTimestampMixin):
 
     @staticmethod
     def from_api_data(api_data: Dict[str, Any]) -> "Trade":
+        # positional arguments, in field order, skip keyword argument matching
         return Trade(
-            _timestamp=api_data["ts"],
-            instrument_id=api_data["instId"],
-            price=float(api_data["px"]),
-            side=api_data["side"],
-            size=float(api_data["sz"]),
-            trade_id=api_data["tradeId"],
+            int(api_data["ts"]),
+            api_data["instId"],
+            float(api_data["px"]),
+            api_data["side"],
+            float(api_data["sz"]),
+            api_data["tradeId"],
         )
 
+    @staticmethod
+    def from_ws_message(msg: str) -> "Trade":
+        """Decode a trades channel websocket message into its trade."""
+        decoder = _trade_message_decoder()
+        if decoder is None:  # pragma: no cover
+            return Trade.from_api_data(_single_data_item(_json.loads(msg)["data"]))
+
+        d = _single_data_item(decoder.decode(msg).data)
+        return Trade(d.ts, d.instId, d.px, d.side, d.sz, d.tradeId)
+
+
+@cache
+def _trade_message_decoder():
+    # msgspec is imported on the first decode rather than with the package,
+    # returns None when it is not installed.
+    try:
+        import msgspec
+    except ImportError:  # pragma: no cover
+        return None
 
-@dataclass
+    # The fields of a trades channel message that Trade needs. msgspec decodes
+    # these straight from the JSON, converting the numeric strings as it goes
+    # (strict=False), without building the intermediate dicts.
+
+    class _TradeData(msgspec.Struct):
+        ts: int
+        instId: str
+        px: float
+        side: str
+        sz: float
+        tradeId: str
+
+    class _TradeMessage(msgspec.Struct):
+        data: List[_TradeData]
+
+    return msgspec.json.Decoder(_TradeMessage, strict=False)
+
+
+@dataclass(slots=True)
 class Order:
     """Simple wrapper for order data.
 
@@ -134,6 +299,68 @@ class Order:
         )
 
 
+@dataclass(eq=False)
+class OrderBookSide(Sequence[Order]):
+    """Column-oriented wrapper for one side of an order book.
+
+    Each field holds one column of the side as a NumPy array, in the same
+    price order as the API returns them. Indexing or iterating the side
+    still gives `Order` objects, built on demand.
+
+    Args:
+        price: The prices paid per unit of the underlying asset
+        size: The numbers of units of the asset
+        num_liquidated_orders: The numbers of liquidated orders at each price
+        num_orders: The numbers of orders at each price
+    """
+
+    price: "np.ndarray"
+    size: "np.ndarray"
+    num_liquidated_orders: "np.ndarray"
+    num_orders: "np.ndarray"
+
+    @staticmethod
+    def from_api_data(api_data: List[List[str]]) -> "OrderBookSide":
+        import numpy as np
+
+        if not api_data:
+            rows = np.empty((0, 4), dtype=object)
+        else:
+            rows = np.array(api_data, dtype=object)
+            if rows.ndim != 2 or rows.shape[1] != 4:
+                raise ValueError("Expected order book data rows of 4 columns")
+        price, size = rows[:, :2].astype(np.float64).T
+        num_liquidated_orders, num_orders = rows[:, 2:].astype(np.int64).T
+        return OrderBookSide(
+            price=price,
+            size=size,
+            num_liquidated_orders=num_liquidated_orders,
+            num_orders=num_orders,
+        )
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    @overload
+    def __getitem__(self, i: int) -> Order: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[Order]: ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return Order(
+            float(self.price[i]),
+            float(self.size[i]),
+            int(self.num_liquidated_orders[i]),
+            int(self.num_orders[i]),
+        )
+
+    def __iter__(self) -> Iterator[Order]:
+        return (self[i] for i in range(len(self)))
+
+
 class OrderBook(ModelTimestampMixin):
     """Simple wrapper for order book data.
 
@@ -145,7 +372,9 @@ class OrderBook(ModelTimestampMixin):
         bids: The bid orders in the book, by price
     """
 
-    def __init__(self, timestamp: str, asks: List[Order], bids: List[Order]):
+    __slots__ = ("_timestamp", "asks", "bids")
+
+    def __init__(self, timestamp: int, asks: OrderBookSide, bids: OrderBookSide):
         self._timestamp = timestamp
         self.asks = asks
         self.bids = bids
@@ -153,7 +382,7 @@ class OrderBook(ModelTimestampMixin):
     @staticmethod
     def from_api_data(api_data: Dict[str, Any]) -> "OrderBook":
         return OrderBook(
-            timestamp=api_data["ts"],
-            asks=list(map(Order.from_api_data, api_data["asks"])),
-            bids=list(map(Order.from_api_data, api_data["bids"])),
+            timestamp=int(api_data["ts"]),
+            asks=OrderBookSide.from_api_data(api_data["asks"]),
+            bids=OrderBookSide.from_api_data(api_data["bids"]),
         )
@@ -0,0 +1,266 @@
+# async_api.py
+# Copyright (C) 2021 Ben Tilley <targansaikhan@gmail.com>
+#
+# Distributed under terms of the MIT license.
+
+
+import asyncio
+import logging
+import os
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from . import _json
+from ._ssl import get_ssl_context
+from .api import STREAM_CHUNK_SIZE, OkexApi
+
+if TYPE_CHECKING:
+    import aiohttp
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+ASYNC_TRANSPORTS = ("aiohttp", "httpx")
+
+
+class AsyncOkexApi(OkexApi):
+    """Asyncio API client for the OKEX crypto trading platform.
+
+    This has the same endpoint methods as `OkexApi`, but they return
+    coroutines that share a single aiohttp connection pool, so many requests
+    can be in flight at once from one thread. Requests are signed exactly as
+    they are by `OkexApi`.
+
+    The client must be used as an async context manager, which opens and
+    closes the underlying HTTP client:
+
+        async with AsyncOkexApi() as api:
+            tickers, trades = await asyncio.gather(
+                api.get_tickers(), api.get_trades(instrument_id="BTC-USDT")
+            )
+
+    Args:
+        api_key: The API key that you create in your OKEX account.
+        passphrase: The passphrase that you gave the API key.
+        secretkey: The secret key that was generated when you created the API key.
+        base_url: The domain of the OKEX API.
+        transport: HTTP library used to talk to the API, "aiohttp" or "httpx".
+            The "httpx" transport uses HTTP/2 so that concurrent requests are
+            multiplexed over one connection; it needs the optional
+            httpx[http2] dependency.
+        hmac_backend: Library used to sign requests, "hashlib" or
+            "cryptography".
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = os.getenv("OKEX_API_KEY"),
+        passphrase: Optional[str] = os.getenv("OKEX_PASSPHRASE"),
+        secretkey: Optional[str] = os.getenv("OKEX_SECRET_KEY"),
+        base_url: str = "www.okex.com",
+        transport: str = "aiohttp",
+        hmac_backend: str = "hashlib",
+    ):
+        super().__init__(
+            api_key=api_key,
+            passphrase=passphrase,
+            secretkey=secretkey,
+            base_url=base_url,
+            transport=transport,
+            hmac_backend=hmac_backend,
+        )
+
+    def _create_transport(self, transport: str):
+        if transport not in ASYNC_TRANSPORTS:
+            raise ValueError(f"transport must be one of {ASYNC_TRANSPORTS}")
+
+        # The HTTP clients must be created inside a running event loop, so
+        # they (and the libraries behind them) are only loaded in __aenter__.
+        self._transport = transport
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    def __enter__(self):
+        raise TypeError("AsyncOkexApi must be used with 'async with', not 'with'")
+
+    async def __aenter__(self) -> "AsyncOkexApi":
+        if self._transport == "httpx":
+            self._client = self._create_async_httpx_client()
+        if self._client is None:
+            try:
+                import aiohttp
+            except ImportError:  # pragma: no cover
+                raise ImportError("AsyncOkexApi requires the aiohttp package") from None
+            self._session = aiohttp.ClientSession(
+                headers=self._headers_template,
+                connector=aiohttp.TCPConnector(ssl=get_ssl_context()),
+            )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _create_async_httpx_client(self) -> Optional["httpx.AsyncClient"]:
+        try:
+            import httpx
+        except ImportError:  # pragma: no cover
+            logger.warning("httpx is not installed, falling back to aiohttp")
+            return None
+        try:
+            return httpx.AsyncClient(
+                http2=True,
+                verify=get_ssl_context(http2=True),
+                base_url=self._url_prefix,
+                headers=self._headers_template,
+                limits=self._httpx_limits(),
+            )
+        except ImportError:
+            logger.warning("h2 is not installed, falling back to aiohttp")
+            return None
+
+    async def close(self):  # type: ignore[override]
+        """Close the underlying HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def make_request(  # type: ignore[override]
+        self,
+        method: str,
+        request_path: str,
+        query_params: Optional[Dict[str, str]] = None,
+        **params: Dict[str, str],
+    ) -> Dict:
+        """Make a signed request to the OKEX API.
+
+        Args:
+            method: The HTTP method e.g. "GET", "POST", etc.
+            request_path: The path of the request URL.
+            query_params: Query string parameters.
+            params: Remaining kwargs make up the request body.
+        """
+        method = method.upper()
+        body = _json.dumps(params) if params else ""
+        if self._client is not None:
+            response = await self._client.send(
+                self._build_httpx_request(method, request_path, query_params, body)
+            )
+            return self._decode_response(response.content, response.status_code)
+
+        async with self._send(method, request_path, query_params, body) as response:
+            content = await response.read()
+        return self._decode_response(content, response.status)
+
+    def _send(  # type: ignore[override]
+        self,
+        method: str,
+        request_path: str,
+        query_params: Optional[Dict[str, str]],
+        body: str,
+    ):
+        if self._session is None:
+            raise RuntimeError("AsyncOkexApi must be used with 'async with'")
+        # already imported by aiohttp when the session was opened
+        from yarl import URL
+
+        if query_params:
+            request_path += self._encode_query_params(query_params)
+
+        # The URL is marked as already encoded so that it is sent exactly as
+        # it was signed.
+        return self._session.request(
+            method,
+            URL(self._url_prefix + request_path, encoded=True),
+            headers=self._get_signed_headers(method, request_path, body),
+            data=body or None,
+        )
+
+    async def iter_get(  # type: ignore[override]
+        self, request_path: str, query_params: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[Any]:
+        """Perform a GET request and stream the records in its data array.
+
+        This is an async generator, see `OkexApi.iter_get`.
+        """
+        try:
+            import ijson
+        except ImportError:  # pragma: no cover
+            raise ImportError("iter_get requires the ijson package") from None
+
+        records = ijson.sendable_list()
+        parser = ijson.items_coro(records, "data.item")
+        async for chunk in self._stream("GET", request_path, query_params):
+            parser.send(chunk)
+            for record in records:
+                yield record
+            del records[:]
+        parser.close()
+        for record in records:
+            yield record
+
+    async def _stream(
+        self,
+        method: str,
+        request_path: str,
+        query_params: Optional[Dict[str, str]],
+    ) -> AsyncIterator[bytes]:
+        """Send a request without a body and yield its response in chunks."""
+        if self._client is not None:
+            response = await self._client.send(
+                self._build_httpx_request(method, request_path, query_params, ""),
+                stream=True,
+            )
+            try:
+                async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    yield chunk
+            finally:
+                await response.aclose()
+            return
+
+        async with self._send(method, request_path, query_params, "") as response:
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                yield chunk
+
+    async def batch_get(  # type: ignore[override]
+        self,
+        paths_and_params: List[Tuple[str, Optional[Dict[str, str]]]],
+        max_workers: int = 10,
+    ) -> List[Dict]:
+        """Perform several GET requests concurrently.
+
+        Args:
+            paths_and_params: (request_path, query_params) pairs to fetch.
+            max_workers: Maximum number of requests in flight at once.
+
+        Returns:
+            The responses, in the same order as ``paths_and_params``.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def get(request_path, query_params):
+            async with semaphore:
+                return await self.get(request_path, query_params)
+
+        return await asyncio.gather(*(get(*args) for args in paths_and_params))
+
+    async def get_many(  # type: ignore[override]
+        self, calls: List[Tuple[str, Dict[str, Any]]], max_workers: int = 8
+    ) -> List[Any]:
+        """Call several endpoint methods concurrently.
+
+        Args:
+            calls: (method name, keyword arguments) pairs to call.
+            max_workers: Maximum number of requests in flight at once.
+
+        Returns:
+            The results of the calls, in the same order as ``calls``.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def call(name, kwargs):
+            async with semaphore:
+                return await getattr(self, name)(**kwargs)
+
+        return await asyncio.gather(*(call(*args) for args in calls))
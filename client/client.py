@@ -4,27 +4,144 @@
 # Distributed under terms of the MIT license.
 
 
+from typing import List
+
 from .api import OkexApi
-from .api_models import CandleStick, OrderBook, Trade
+from .async_api import AsyncOkexApi
+from .api_models import CandleStick, CandleStickBatch, OrderBook, Trade
+from .query_params import CANDLE_DURATIONS
+
+# Maximum number of candles returned by one history candlesticks request.
+HISTORY_PAGE_LIMIT = 100
 
 
 class OkexClient(OkexApi):
+    # The wrapped endpoint methods, bound here so that each call is a plain
+    # attribute lookup rather than going through a super() proxy.
+    _api_get_candlesticks = OkexApi.get_candlesticks
+    _api_get_candlesticks_history = OkexApi.get_candlesticks_history
+    _api_get_order_book = OkexApi.get_order_book
+    _api_get_trades = OkexApi.get_trades
+
     def get_candlesticks(self, **query_params):
-        response = super().get_candlesticks(**query_params)
+        response = self._api_get_candlesticks(**query_params)
         data = response["data"]
-        return list(map(CandleStick.from_api_data, data))
+        return CandleStick.from_api_data_bulk(data)
 
     def get_candlesticks_history(self, **query_params):
-        response = super().get_candlesticks_history(**query_params)
+        response = self._api_get_candlesticks_history(**query_params)
         data = response["data"]
-        return list(map(CandleStick.from_api_data, data))
+        return CandleStick.from_api_data_bulk(data)
 
     def get_order_book(self, **query_params):
-        response = super().get_order_book(**query_params)
+        response = self._api_get_order_book(**query_params)
         data = response["data"]
         return OrderBook.from_api_data(data[0])
 
     def get_trades(self, **query_params):
-        response = super().get_trades(**query_params)
+        response = self._api_get_trades(**query_params)
+        data = response["data"]
+        return list(map(Trade.from_api_data, data))
+
+
+class AsyncOkexClient(AsyncOkexApi):
+    # see OkexClient
+    _api_get_candlesticks = AsyncOkexApi.get_candlesticks
+    _api_get_candlesticks_history = AsyncOkexApi.get_candlesticks_history
+    _api_get_order_book = AsyncOkexApi.get_order_book
+    _api_get_trades = AsyncOkexApi.get_trades
+
+    async def get_candlesticks(self, **query_params):
+        response = await self._api_get_candlesticks(**query_params)
+        data = response["data"]
+        return CandleStick.from_api_data_bulk(data)
+
+    async def get_candlesticks_many(
+        self, instrument_ids: List[str], max_workers: int = 8, **query_params
+    ) -> List[CandleStickBatch]:
+        """Get the candlesticks of several instruments concurrently.
+
+        Args:
+            instrument_ids: Instrument IDs, e.g. ["BTC-USDT", "ETH-USDT"]
+            max_workers: Maximum number of requests in flight at once.
+            query_params: Other parameters of `get_candlesticks`, which are
+                the same for every instrument.
+        """
+        return await self.get_many(
+            [
+                ("get_candlesticks", {"instrument_id": i, **query_params})
+                for i in instrument_ids
+            ],
+            max_workers=max_workers,
+        )
+
+    async def get_candlesticks_history(self, **query_params):
+        response = await self._api_get_candlesticks_history(**query_params)
+        data = response["data"]
+        return CandleStick.from_api_data_bulk(data)
+
+    async def get_candlesticks_history_range(
+        self,
+        instrument_id: str,
+        start: int,
+        end: int,
+        candle_size: str = "1m",
+        max_workers: int = 8,
+    ) -> CandleStickBatch:
+        """Get the history candlesticks of an instrument between two times.
+
+        The range is split up front into pages of HISTORY_PAGE_LIMIT candles,
+        so that the pages can be fetched concurrently instead of following
+        the pagination cursor one request at a time.
+
+        Args:
+            instrument_id: Instrument ID, e.g. "BTC-USDT"
+            start: Start of the range, in Unix milliseconds (inclusive)
+            end: End of the range, in Unix milliseconds (exclusive)
+            candle_size: Bar size, e.g. "1m" "1H" "1D" "1W". Month and year
+                bars have no fixed length and are not supported.
+            max_workers: Maximum number of requests in flight at once.
+
+        Returns:
+            The candlesticks in the range, newest first as the API returns them.
+        """
+        if candle_size not in CANDLE_DURATIONS:
+            raise ValueError(
+                f"candle_size must be one of {tuple(CANDLE_DURATIONS)} "
+                "to fetch a range"
+            )
+        page_span = CANDLE_DURATIONS[candle_size] * HISTORY_PAGE_LIMIT
+        page_ends = range(end, start, -page_span)
+        pages = await self.get_many(
+            [
+                (
+                    "get_candlesticks_history",
+                    {
+                        "instrument_id": instrument_id,
+                        "after": page_end,
+                        "candle_size": candle_size,
+                        "limit": HISTORY_PAGE_LIMIT,
+                    },
+                )
+                for page_end in page_ends
+            ],
+            max_workers=max_workers,
+        )
+        # a page reaches further back than its span if candles are missing,
+        # so clip each one to its own span to avoid duplicates
+        return CandleStickBatch.concatenate(
+            [
+                page.between(max(start, page_end - page_span), page_end)
+                for page_end, page in zip(page_ends, pages)
+            ]
+        )
+
+    async def get_order_book(self, **query_params):
+        response = await self._api_get_order_book(**query_params)
+        data = response["data"]
+        return OrderBook.from_api_data(data[0])
+
+    async def get_trades(self, **query_params):
+        response = await self._api_get_trades(**query_params)
         data = response["data"]
         return list(map(Trade.from_api_data, data))
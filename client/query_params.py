@@ -3,46 +3,73 @@
 #
 # Distributed under terms of the MIT license.
 
-from datetime import datetime
-
-
-CANDLE_SIZES = [
-    "1m",
-    "3m",
-    "5m",
-    "15m",
-    "30m",
-    "1H",
-    "2H",
-    "4H",
-    "6H",
-    "12H",
-    "1D",
-    "1W",
-    "1M",
-    "3M",
-    "6M",
-    "1Y",
-]
+# 3000-01-01T00:00:00Z in UNIX milliseconds, the latest accepted timestamp.
+MAX_TIMESTAMP = 32_503_680_000_000
+
+CANDLE_SIZES = frozenset(
+    [
+        "1m",
+        "3m",
+        "5m",
+        "15m",
+        "30m",
+        "1H",
+        "2H",
+        "4H",
+        "6H",
+        "12H",
+        "1D",
+        "1W",
+        "1M",
+        "3M",
+        "6M",
+        "1Y",
+    ]
+)
+
+# Length in milliseconds of the candle sizes that have a fixed length. Month
+# and year candles vary in length, so they are not included.
+CANDLE_DURATIONS = {
+    "1m": 60_000,
+    "3m": 3 * 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1H": 3_600_000,
+    "2H": 2 * 3_600_000,
+    "4H": 4 * 3_600_000,
+    "6H": 6 * 3_600_000,
+    "12H": 12 * 3_600_000,
+    "1D": 86_400_000,
+    "1W": 7 * 86_400_000,
+}
 
 
 class QueryParams(dict):
+    __slots__ = ()
+
     def __init__(self, **kwargs):
-        for k, v in kwargs.items():
-            self.add_param(k, v)
+        # add_param inlined, this runs for every parameterised request
+        validators = self._VALIDATORS
+        for key, value in kwargs.items():
+            if value is not None:
+                validate = validators.get(key)
+                if validate is None:
+                    raise KeyError(f"QueryParams does not support {key}")
+                self[key] = validate(self, value)
 
     def add_param(self, key, value):
         if value is not None:
-            if not hasattr(self, key):
+            validate = self._VALIDATORS.get(key)
+            if validate is None:
                 raise KeyError(f"QueryParams does not support {key}")
-            self[key] = getattr(self, key)(value)
+            self[key] = validate(self, value)
 
     @staticmethod
     def assert_timestamp(ts):
         if isinstance(ts, str):
-            ts = int(ts)
-        d = datetime.utcfromtimestamp(ts / 1000)
-        if d >= datetime(1970, 1, 1):
+            ts = int(ts, 10)
+        if 0 <= ts <= MAX_TIMESTAMP:
             return ts
         raise ValueError(f"{ts} is not a valid timestamp (should be UNIX milliseconds")
 
@@ -50,7 +77,8 @@ class QueryParams(dict):
         return self.assert_timestamp(after)
 
     def bar(self, candle_size):
-        assert candle_size in CANDLE_SIZES
+        if candle_size not in CANDLE_SIZES:
+            raise ValueError(f"{candle_size} is not a valid candle size")
         return candle_size
 
     def before(self, before):
@@ -68,11 +96,28 @@ class QueryParams(dict):
         return instrument_id
 
     def limit(self, limit):
-        assert isinstance(limit, int), "limit must be an integer"
-        assert limit > 0, "limit must be greater than 0"
+        if type(limit) is not int:
+            raise TypeError("limit must be an integer")
+        if limit <= 0:
+            raise ValueError("limit must be greater than 0")
         return str(limit)
 
     def sz(self, size):
-        assert isinstance(size, int), "size must be an integer"
-        assert size > 0, "size must be greater than 0"
+        if type(size) is not int:
+            raise TypeError("size must be an integer")
+        if size <= 0:
+            raise ValueError("size must be greater than 0")
         return size
+
+    # The supported parameters. Looking them up here, rather than with
+    # getattr, is faster and stops dict methods being taken for parameters.
+    _VALIDATORS = {
+        "after": after,
+        "bar": bar,
+        "before": before,
+        "ccy": ccy,
+        "instType": instType,
+        "instId": instId,
+        "limit": limit,
+        "sz": sz,
+    }
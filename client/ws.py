@@ -10,15 +10,29 @@ import os
 # from datetime import datetime
 # import hmac
 # import hashlib
-import json
 import logging
 import websockets
 
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
 # from typing import Any, Awaitable, Callable, Optional
 
+from . import _json
+from .api_models import _single_data_item
+from ._ssl import get_ssl_context
+
 logger = logging.getLogger(__name__)
 
+# Number of received messages websockets buffers before it stops reading the
+# socket. Its reader task already drains the socket concurrently with the
+# consumer, so this is the queue that absorbs bursts of trades.
+MAX_QUEUE = 1024
+
+# Largest message accepted, and the high water marks of the socket's read
+# and write buffers, sized for full order book snapshots and trade bursts.
+MAX_SIZE = 2**22
+READ_LIMIT = 2**18
+WRITE_LIMIT = 2**18
 
 PUBLIC_CHANNELS = {
     "books",
@@ -46,6 +60,21 @@ PRIVATE_CHANNELS = {
 }
 
 
+def _encode_subscribe_request(channel: str, args: Dict[str, Any]) -> str:
+    return _json.dumps({"op": "subscribe", "args": [{"channel": channel, **args}]})
+
+
+@lru_cache(maxsize=128)
+def _subscribe_request(channel: str, args: Tuple[Tuple[str, Any], ...]) -> str:
+    # Reconnecting resubscribes with the same arguments, so the encoded
+    # requests are kept rather than rebuilt.
+    return _encode_subscribe_request(channel, dict(args))
+
+
+def _decode_trade(msg: str) -> Dict[str, Any]:
+    return _single_data_item(_json.loads(msg)["data"])
+
+
 class SocketContext:
     def __init__(self, socket, channel):
         self.socket = socket
@@ -78,6 +107,9 @@ class OkexWebsocketsApi:
         secretkey: The secret key that was generated when you created the API key.
         base_url: The domain of the OKEX API.
         base_ws_url: The domain of the OKEX WebSockets API.
+        compression: Websocket compression extension to negotiate, e.g.
+            "deflate". Off by default, as inflating every message of a busy
+            channel costs about as much CPU as parsing it.
     """
 
     def __init__(
@@ -86,6 +118,7 @@ class OkexWebsocketsApi:
         passphrase: Optional[str] = os.getenv("OKEX_PASSPHRASE"),
         secretkey: Optional[str] = os.getenv("OKEX_SECRET_KEY"),
         base_url: str = "ws.okex.com:8443/ws",
+        compression: Optional[str] = None,
     ):
         if secretkey is None:
             logger.warning("OkexWebsocketsApi does not have a secret key")
@@ -100,6 +133,7 @@ class OkexWebsocketsApi:
         self.secretkey = secretkey
         self.base_url = base_url
         self.protocol = "wss"
+        self.compression = compression
         logger.info("OKEX Websocket Client Initialised")
 
     def connect(self, visibility: str):
@@ -109,7 +143,16 @@ class OkexWebsocketsApi:
             visibility: "public" or "private" - namespace of the requested channel
         """
         uri = f"{self.protocol}://{self.base_url}/v5/{visibility}"
-        return websockets.connect(uri, ssl=True, ping_interval=25)  # type: ignore
+        return websockets.connect(  # type: ignore
+            uri,
+            ssl=get_ssl_context(),
+            ping_interval=25,
+            compression=self.compression,
+            max_size=MAX_SIZE,
+            max_queue=MAX_QUEUE,
+            read_limit=READ_LIMIT,
+            write_limit=WRITE_LIMIT,
+        )
 
     def get_channel_visibility(self, channel: str):
         """Get the visibility level of a channel.
@@ -127,6 +170,22 @@ class OkexWebsocketsApi:
         else:
             raise ValueError(f"Value {channel} is not a valid channel")
 
+    @staticmethod
+    def get_subscribe_request(channel: str, **kwargs) -> str:
+        """Get the JSON request that subscribes to a channel.
+
+        Args:
+            channel: The channel that you want to connect to, e.g. "trades"
+            kwargs: Configuration data that needs to be sent in the initial handshake
+        """
+        # Only str arguments are cached: values of other types can compare
+        # equal (1, 1.0 and True) and would share an entry but encode
+        # differently, and lists are unhashable.
+        for value in kwargs.values():
+            if type(value) is not str:
+                return _encode_subscribe_request(channel, kwargs)
+        return _subscribe_request(channel, tuple(kwargs.items()))
+
     async def subscribe(self, channel: str, **kwargs):
         """Set up a websocket connection to a channel.
 
@@ -137,16 +196,15 @@ class OkexWebsocketsApi:
             channel: The channel that you want to connect to, e.g. "trades"
             kwargs: Configuration data that needs to be sent in the initial handshake
         """
-        request = {"op": "subscribe", "args": [{"channel": channel, **kwargs}]}
         visibility = self.get_channel_visibility(channel)
 
         socket = await self.connect(visibility=visibility)
-        await socket.send(json.dumps(request))
-        response = json.loads(await socket.recv())
+        await socket.send(self.get_subscribe_request(channel, **kwargs))
+        response = _json.loads(await socket.recv())
 
-        logger.debug(f"Websocket connection response: {response}")
+        logger.debug("Websocket connection response: %s", response)
         if response["event"] == "subscribe":
-            logger.info(f"Subscribed to channel: {channel}")
+            logger.info("Subscribed to channel: %s", channel)
         elif response["event"] == "error":
             raise RuntimeError(
                 f"Subscription to channel {channel} failed "
@@ -155,7 +213,7 @@ class OkexWebsocketsApi:
 
         return SocketContext(socket, channel)
 
-    async def trades(self, instrument_id: str):
+    async def trades(self, instrument_id: str, bypass_parsing: bool = False):
         """Connect to the trade channel to receive new trade messages.
 
         This method is an async generator, iterate over it to receive the trade
@@ -163,13 +221,44 @@ class OkexWebsocketsApi:
 
         Args:
             instrument_id: Instrument ID, e.g. "BTC-USDT"
+            bypass_parsing: Yield each websocket message as received, without
+                decoding it, e.g. to forward the raw JSON elsewhere.
         """
         # trades = await self.subscribe(channel="trades", instId=instrument_id)
         async with await self.subscribe(
             channel="trades", instId=instrument_id
         ) as socket:
+            if bypass_parsing:
+                async for msg in socket:
+                    yield msg
+                return
+            async for msg in socket:
+                yield _decode_trade(msg)
+
+    async def run_trades(
+        self,
+        instrument_id: str,
+        callback: Callable[[Any], Any],
+        bypass_parsing: bool = False,
+    ):
+        """Connect to the trade channel and call a function with each new trade.
+
+        This is the push based version of `trades`, it calls the callback
+        directly from the receive loop instead of suspending an async generator
+        for every message. It returns when the connection is closed.
+
+        Args:
+            instrument_id: Instrument ID, e.g. "BTC-USDT"
+            callback: Plain (not async) function to call with each trade's data.
+            bypass_parsing: Call the callback with the raw websocket message
+                instead of the decoded trade data.
+        """
+        async with await self.subscribe(
+            channel="trades", instId=instrument_id
+        ) as socket:
+            if bypass_parsing:
+                async for msg in socket:
+                    callback(msg)
+                return
             async for msg in socket:
-                data = json.loads(msg)["data"]
-                if len(data) > 1:
-                    raise ValueError("More data in websocket message than expected")
-                yield data[0]
+                callback(_decode_trade(msg))
@@ -4,11 +4,29 @@
 # Distributed under terms of the MIT license.
 
 
+from typing import Any, Callable
+
 from .ws import OkexWebsocketsApi
 from .api_models import Trade
 
 
 class OkexWebsocketsClient(OkexWebsocketsApi):
-    async def trades(self, instrument_id: str):
-        async for trade_data in super().trades(instrument_id=instrument_id):
-            yield Trade.from_api_data(trade_data)
+    async def trades(self, instrument_id: str, bypass_parsing: bool = False):
+        async for msg in super().trades(instrument_id, bypass_parsing=True):
+            yield msg if bypass_parsing else Trade.from_ws_message(msg)
+
+    async def run_trades(
+        self,
+        instrument_id: str,
+        callback: Callable[[Any], Any],
+        bypass_parsing: bool = False,
+    ):
+        if bypass_parsing:
+            await super().run_trades(instrument_id, callback, bypass_parsing=True)
+            return
+        from_ws_message = Trade.from_ws_message
+        await super().run_trades(
+            instrument_id,
+            lambda msg: callback(from_ws_message(msg)),
+            bypass_parsing=True,
+        )
@@ -6,10 +6,18 @@
 
 from setuptools import setup, find_packages
 
-
 setup(
     name="okex-api-v5",
     version="0.1.0",
     packages=find_packages(include=["client", "client.*"]),
     package_data={"client": ["py.typed"]},
+    python_requires=">=3.10",
+    extras_require={
+        "async": ["aiohttp"],
+        "cryptography": ["cryptography"],
+        "http2": ["httpx[http2]"],
+        "ijson": ["ijson"],
+        "msgspec": ["msgspec"],
+        "orjson": ["orjson"],
+    },
 )
@@ -0,0 +1,209 @@
+# test_api.py
+# Copyright (C) 2021 Ben Tilley <targansaikhan@gmail.com>
+#
+# Distributed under terms of the MIT license.
+
+
+import base64
+import hashlib
+import hmac
+import json
+import re
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+from client import OkexApi
+from client.api import ENDPOINTS
+
+
+def reference_signature(secretkey, time_stamp, method, request_path, body):
+    prehash = time_stamp + method + request_path + body
+    digest = hmac.new(
+        bytes(secretkey, "ascii"), bytes(prehash, "ascii"), hashlib.sha256
+    ).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+class TestOkexApi:
+    @pytest.fixture(params=["hashlib", "cryptography"])
+    def api(self, request):
+        return OkexApi(
+            api_key="key",
+            passphrase="passphrase",
+            secretkey="secret",
+            hmac_backend=request.param,
+        )
+
+    @pytest.fixture
+    def sent_requests(self, api, monkeypatch):
+        """Capture the requests the session sends instead of sending them."""
+        sent = []
+
+        class Response:
+            content = b"{}"
+            status_code = 200
+
+        def send(request, **kwargs):
+            sent.append(request)
+            return Response()
+
+        monkeypatch.setattr(api._session, "send", send)
+        return sent
+
+    def test_get_signature(self, api):
+        args = ("2021-05-29T17:01:17.123Z", "GET", "/api/v5/account/balance", "")
+        assert api.get_signature(*args) == reference_signature("secret", *args)
+        # the keyed template must not be consumed by signing
+        assert api.get_signature(*args) == reference_signature("secret", *args)
+
+    @pytest.mark.parametrize("secretkey", ["", "s" * 64, "s" * 65])
+    def test_get_signature_key_lengths(self, secretkey):
+        api = OkexApi(api_key="key", passphrase="passphrase", secretkey=secretkey)
+        args = ("2021-05-29T17:01:17.123Z", "GET", "/api/v5/account/balance", "")
+        assert api.get_signature(*args) == reference_signature(secretkey, *args)
+
+    def test_get_signature_with_body(self, api):
+        args = ("2021-05-29T17:01:17.123Z", "POST", "/api/v5/trade/order", '{"sz":"1"}')
+        assert api.get_signature(*args) == reference_signature("secret", *args)
+
+    def test_get_timestamp(self):
+        before = datetime.utcnow().replace(microsecond=0)
+        time_stamp = OkexApi.get_timestamp()
+        assert re.fullmatch(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z", time_stamp)
+        parsed = datetime.strptime(time_stamp, "%Y-%m-%dT%H:%M:%S.%fZ")
+        assert before <= parsed <= datetime.utcnow()
+
+    def test_make_request_query_string(self, api, sent_requests):
+        api.get(
+            "/api/v5/market/tickers",
+            {"instId": "BTC-USDT", "ccy": "BTC,ETH", "limit": "5", "uly": "a b/c"},
+        )
+        [request] = sent_requests
+        request_path = (
+            "/api/v5/market/tickers?instId=BTC-USDT&ccy=BTC%2CETH&limit=5&uly=a+b%2Fc"
+        )
+        assert request.method == "GET"
+        assert request.url == "https://www.okex.com" + request_path
+        assert request.headers["OK-ACCESS-SIGN"] == reference_signature(
+            "secret", request.headers["OK-ACCESS-TIMESTAMP"], "GET", request_path, ""
+        )
+
+    def test_batch_get(self, api, monkeypatch):
+        def get(request_path, query_params=None):
+            return {"path": request_path, "params": query_params}
+
+        monkeypatch.setattr(api, "get", get)
+        paths_and_params = [
+            ("/api/v5/market/ticker", {"instId": f"{ccy}-USDT"})
+            for ccy in ("BTC", "ETH", "XCH", "LTC")
+        ]
+        responses = api.batch_get(paths_and_params, max_workers=2)
+        assert [(r["path"], r["params"]) for r in responses] == paths_and_params
+
+    def test_get_headers(self, api):
+        headers = api.get_headers("GET", "/api/v5/account/balance", "")
+        assert headers["OK-ACCESS-KEY"] == "key"
+        assert headers["OK-ACCESS-PASSPHRASE"] == "passphrase"
+        assert headers["OK-ACCESS-SIGN"] == reference_signature(
+            "secret",
+            headers["OK-ACCESS-TIMESTAMP"],
+            "GET",
+            "/api/v5/account/balance",
+            "",
+        )
+        assert api._session.headers["OK-ACCESS-KEY"] == "key"
+        assert api._session.headers["OK-ACCESS-PASSPHRASE"] == "passphrase"
+
+    def test_make_request_body(self, api, sent_requests):
+        api.make_request("post", "/api/v5/trade/order", instId="BTC-USDT", sz="1")
+        [request] = sent_requests
+        assert request.body == '{"instId":"BTC-USDT","sz":"1"}'
+        assert request.headers["OK-ACCESS-SIGN"] == reference_signature(
+            "secret",
+            request.headers["OK-ACCESS-TIMESTAMP"],
+            "POST",
+            "/api/v5/trade/order",
+            request.body,
+        )
+
+    def test_make_request_non_ascii_body(self, api, sent_requests):
+        api.make_request("post", "/api/v5/trade/order", tag="café")
+        [request] = sent_requests
+        assert request.body == '{"tag":"caf\\u00e9"}'
+        assert request.body == json.dumps({"tag": "café"}, separators=(",", ":"))
+        assert request.headers["OK-ACCESS-SIGN"] == reference_signature(
+            "secret",
+            request.headers["OK-ACCESS-TIMESTAMP"],
+            "POST",
+            "/api/v5/trade/order",
+            request.body,
+        )
+
+    @pytest.mark.parametrize(
+        "content, expected",
+        [
+            (b'{"code":"0","data":[]}', {"code": "0", "data": []}),
+            (b"", {}),
+            (
+                b"<html>Bad Gateway</html>",
+                {"_raw": b"<html>Bad Gateway</html>", "_status": 502},
+            ),
+        ],
+    )
+    def test_parse_response(self, content, expected):
+        class Response:
+            status_code = 502
+
+        response = Response()
+        response.content = content
+        assert OkexApi._parse_response(response) == expected
+
+    def test_get_many(self, api, monkeypatch):
+        def get(request_path, query_params=None):
+            return {"path": request_path, "params": dict(query_params or {})}
+
+        monkeypatch.setattr(api, "get", get)
+        responses = api.get_many(
+            [
+                ("get_ticker", {"instrument_id": "BTC-USDT"}),
+                ("get_trades", {"instrument_id": "ETH-USDT", "limit": 5}),
+                ("get_total_volume", {}),
+            ]
+        )
+        assert responses == [
+            {"path": "/api/v5/market/ticker", "params": {"instId": "BTC-USDT"}},
+            {
+                "path": "/api/v5/market/trades",
+                "params": {"instId": "ETH-USDT", "limit": "5"},
+            },
+            {"path": "/api/v5/market/platform-24-volume", "params": {}},
+        ]
+
+    def test_endpoints(self, api):
+        # every endpoint in the table is wrapped by a method of the same name
+        for name in ENDPOINTS:
+            assert callable(getattr(api, name))
+
+    @pytest.mark.vcr()
+    @pytest.mark.parametrize(
+        "vcr_cassette_name", ["TestOkexClient.test_get_candlesticks"]
+    )
+    def test_get_candlesticks_iter(self, api, vcr_cassette_name):
+        candlesticks = list(
+            api.get_candlesticks_iter(instrument_id="XCH-USDT", limit=5)
+        )
+        assert len(candlesticks) == 5
+        for candlestick in candlesticks:
+            assert len(candlestick) == 7
+            assert all(isinstance(value, str) for value in candlestick)
+
+    def test_import_defers_optional_backends(self):
+        # the slow libraries are only imported by the code that uses them
+        modules = ["aiohttp", "cryptography", "httpx", "ijson", "msgspec", "numpy"]
+        code = f"import sys, client; print([m for m in {modules} if m in sys.modules])"
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "[]"
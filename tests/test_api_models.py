@@ -0,0 +1,157 @@
+# test_api_models.py
+# Copyright (C) 2021 Ben Tilley <targansaikhan@gmail.com>
+#
+# Distributed under terms of the MIT license.
+
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from client.api_models import CandleStick, CandleStickBatch, Order, OrderBookSide, Trade
+
+CANDLESTICK_DATA = [
+    ["1622301480000", "780.4", "781", "779", "780.8", "18.286894", "14269.184376"],
+    ["1622301420000", "780.7", "781", "780.4", "780.4", "3.011522", "2351.079778"],
+]
+
+
+class TestCandleStick:
+    def test_timestamp(self):
+        candlestick = CandleStick.from_api_data(CANDLESTICK_DATA[0])
+        assert candlestick.timestamp == datetime(
+            2021, 5, 29, 15, 18, 0, tzinfo=timezone.utc
+        )
+        candlestick = CandleStick.from_api_data(["1622301480123", *"111111"])
+        assert candlestick.timestamp.microsecond == 123000
+
+    def test_slots(self):
+        candlestick = CandleStick.from_api_data(CANDLESTICK_DATA[0])
+        assert not hasattr(candlestick, "__dict__")
+        assert candlestick.change == 0.4
+        assert candlestick.spread == 2.0
+
+
+class TestCandleStickBatch:
+    def test_from_api_data(self):
+        batch = CandleStickBatch.from_api_data(CANDLESTICK_DATA)
+        assert len(batch) == 2
+        assert batch.timestamps.dtype == np.dtype("datetime64[ms]")
+        assert batch.timestamps[0] == np.datetime64(1622301480000, "ms")
+        np.testing.assert_array_equal(batch.close, [780.8, 780.4])
+        np.testing.assert_array_equal(batch.change, [0.4, -0.3])
+        np.testing.assert_array_equal(batch.spread, [2.0, 0.6])
+
+    def test_rows(self):
+        batch = CandleStickBatch.from_api_data(CANDLESTICK_DATA)
+        expected = list(map(CandleStick.from_api_data, CANDLESTICK_DATA))
+        assert list(batch) == expected
+        assert batch[-1] == expected[-1]
+        assert batch[:1] == expected[:1]
+
+    def test_empty(self):
+        batch = CandleStickBatch.from_api_data([])
+        assert len(batch) == 0
+        assert list(batch) == []
+
+    def test_from_api_data_bulk(self):
+        batch = CandleStick.from_api_data_bulk(CANDLESTICK_DATA)
+        assert isinstance(batch, CandleStickBatch)
+        assert batch.to_records() == [
+            CandleStick.from_api_data(row) for row in CANDLESTICK_DATA
+        ]
+
+    def test_from_api_data_empty(self):
+        assert len(CandleStickBatch.from_api_data([])) == 0
+
+    @pytest.mark.parametrize(
+        "api_data",
+        [
+            [[*CANDLESTICK_DATA[0], "1", "0"]] * 7,
+            [CANDLESTICK_DATA[0], CANDLESTICK_DATA[1][:6]],
+        ],
+    )
+    def test_from_api_data_wrong_columns(self, api_data):
+        with pytest.raises(ValueError, match="7 columns"):
+            CandleStickBatch.from_api_data(api_data)
+
+    def test_between_and_concatenate(self):
+        batch = CandleStickBatch.from_api_data(CANDLESTICK_DATA)
+        newest = batch.between(1622301480000, 1622301540000)
+        oldest = batch.between(0, 1622301480000)
+        assert len(newest) == len(oldest) == 1
+        assert CandleStickBatch.concatenate([newest, oldest]).to_records() == list(
+            batch
+        )
+        assert len(CandleStickBatch.concatenate([])) == 0
+
+
+class TestOrderBookSide:
+    def test_from_api_data(self):
+        rows = [["411.8", "10", "0", "4"], ["411.9", "1.5", "0", "1"]]
+        side = OrderBookSide.from_api_data(rows)
+        assert side.price.dtype == np.float64
+        assert side.num_orders.dtype == np.int64
+        assert side.size.tolist() == [10.0, 1.5]
+        assert list(side) == [Order.from_api_data(row) for row in rows]
+        assert side[-1] == Order(411.9, 1.5, 0, 1)
+        assert side[:1] == [Order(411.8, 10.0, 0, 4)]
+
+    def test_empty(self):
+        assert len(OrderBookSide.from_api_data([])) == 0
+
+    @pytest.mark.parametrize(
+        "api_data",
+        [
+            [["1", "2", "0", "3", "4", "5", "0", "6"]],
+            [["411.8", "10", "0", "4"], ["411.9", "1.5", "0"]],
+        ],
+    )
+    def test_from_api_data_wrong_columns(self, api_data):
+        with pytest.raises(ValueError, match="4 columns"):
+            OrderBookSide.from_api_data(api_data)
+
+
+class TestTrade:
+    def test_from_api_data(self):
+        trade = Trade.from_api_data(
+            {
+                "instId": "BTC-USDT",
+                "tradeId": "130639474",
+                "px": "42219.9",
+                "sz": "0.12060306",
+                "side": "buy",
+                "ts": "1630048897897",
+            }
+        )
+        assert trade == Trade(
+            _timestamp=1630048897897,
+            instrument_id="BTC-USDT",
+            price=42219.9,
+            side="buy",
+            size=0.12060306,
+            trade_id="130639474",
+        )
+
+    def test_from_ws_message(self):
+        msg = (
+            '{"arg":{"channel":"trades","instId":"BTC-USDT"},"data":[{"instId":'
+            '"BTC-USDT","tradeId":"130639474","px":"42219.9","sz":"0.12060306",'
+            '"side":"buy","ts":"1630048897897"}]}'
+        )
+        assert Trade.from_ws_message(msg) == Trade(
+            _timestamp=1630048897897,
+            instrument_id="BTC-USDT",
+            price=42219.9,
+            side="buy",
+            size=0.12060306,
+            trade_id="130639474",
+        )
+
+    def test_from_ws_message_rejects_several_trades(self):
+        trade = (
+            '{"instId":"BTC-USDT","tradeId":"1","px":"1","sz":"1","side":"buy",'
+            '"ts":"1630048897897"}'
+        )
+        with pytest.raises(ValueError):
+            Trade.from_ws_message(f'{{"data":[{trade},{trade}]}}')
@@ -0,0 +1,90 @@
+# test_async_api.py
+# Copyright (C) 2021 Ben Tilley <targansaikhan@gmail.com>
+#
+# Distributed under terms of the MIT license.
+
+
+import asyncio
+
+import pytest
+import requests
+from client import AsyncOkexApi
+
+
+class TestAsyncOkexApi:
+    @pytest.fixture
+    def vcr_cassette_name(self):
+        # replay the interaction recorded for the synchronous client
+        return "TestOkexClient.test_get_trades"
+
+    @pytest.mark.vcr(decode_compressed_response=True)
+    def test_get_trades(self):
+        async def test():
+            async with AsyncOkexApi() as api:
+                return await api.get_trades(instrument_id="BTC-USDT", limit=5)
+
+        response = asyncio.run(test())
+        assert len(response["data"]) == 5
+        for trade in response["data"]:
+            assert trade["instId"] == "BTC-USDT"
+
+    @pytest.mark.vcr(decode_compressed_response=True)
+    def test_get_trades_httpx(self):
+        async def test():
+            async with AsyncOkexApi(transport="httpx") as api:
+                assert api._client is not None
+                return await api.get_trades(instrument_id="BTC-USDT", limit=5)
+
+        response = asyncio.run(test())
+        assert len(response["data"]) == 5
+
+    def test_send_query_string(self):
+        calls = []
+
+        class Session:
+            def request(self, method, url, headers, data):
+                calls.append((url, headers))
+
+        api = AsyncOkexApi(api_key="key", passphrase="passphrase", secretkey="secret")
+        api._session = Session()
+        query_params = {"ccy": "BTC,ETH", "instId": "a b/c"}
+        api._send("GET", "/api/v5/account/balance", query_params, "")
+        [(url, headers)] = calls
+        request_path = "/api/v5/account/balance?ccy=BTC%2CETH&instId=a+b%2Fc"
+        assert str(url) == "https://www.okex.com" + request_path
+        # the same query string that the requests transport sends
+        prepared = requests.Request(
+            "GET", "https://www.okex.com/api/v5/account/balance", params=query_params
+        ).prepare()
+        assert prepared.path_url == request_path
+        assert headers["OK-ACCESS-SIGN"] == api.get_signature(
+            headers["OK-ACCESS-TIMESTAMP"], "GET", request_path, ""
+        )
+
+    def test_requires_context_manager(self):
+        with pytest.raises(RuntimeError, match="async with"):
+            asyncio.run(AsyncOkexApi().get_tickers())
+
+    def test_sync_context_manager(self):
+        with pytest.raises(TypeError, match="async with"):
+            with AsyncOkexApi():
+                pass
+
+    @pytest.mark.vcr(decode_compressed_response=True)
+    @pytest.mark.parametrize(
+        "vcr_cassette_name", ["TestOkexClient.test_get_candlesticks"]
+    )
+    def test_get_candlesticks_iter(self, vcr_cassette_name):
+        async def test():
+            async with AsyncOkexApi() as api:
+                return [
+                    candlestick
+                    async for candlestick in api.get_candlesticks_iter(
+                        instrument_id="XCH-USDT", limit=5
+                    )
+                ]
+
+        candlesticks = asyncio.run(test())
+        assert len(candlesticks) == 5
+        for candlestick in candlesticks:
+            assert len(candlestick) == 7
@@ -4,8 +4,11 @@
 # Distributed under terms of the MIT license.
 
 
+import asyncio
 import pytest
 from datetime import datetime
+from client import AsyncOkexClient
+from client.api_models import CandleStick, CandleStickBatch
 
 
 class TestOkexClient:
@@ -32,7 +35,7 @@ class TestOkexClient:
         assert isinstance(order_book.timestamp, datetime)
         assert len(order_book.asks) == 5
         assert len(order_book.bids) == 5
-        for order in order_book.asks + order_book.bids:
+        for order in [*order_book.asks, *order_book.bids]:
             assert isinstance(order.price, float)
             assert isinstance(order.size, float)
             assert isinstance(order.num_liquidated_orders, int)
@@ -49,3 +52,58 @@ class TestOkexClient:
             assert trade.side == "sell" or trade.side == "buy"
             assert isinstance(trade.size, float)
             assert isinstance(trade.trade_id, str)
+
+
+class TestAsyncOkexClient:
+    @pytest.mark.vcr(decode_compressed_response=True, allow_playback_repeats=True)
+    @pytest.mark.parametrize(
+        "vcr_cassette_name", ["TestOkexClient.test_get_candlesticks"]
+    )
+    def test_get_candlesticks_many(self, vcr_cassette_name):
+        async def test():
+            async with AsyncOkexClient() as client:
+                return await client.get_candlesticks_many(
+                    ["XCH-USDT", "XCH-USDT"], limit=5
+                )
+
+        batches = asyncio.run(test())
+        assert len(batches) == 2
+        for batch in batches:
+            assert isinstance(batch, CandleStickBatch)
+            assert len(batch) == 5
+
+    def test_get_candlesticks_history_range(self, monkeypatch):
+        client = AsyncOkexClient()
+        calls = []
+
+        async def get_candlesticks_history(**query_params):
+            calls.append(query_params)
+            after = query_params["after"]
+            # a full page of one minute candles, newest first
+            return CandleStick.from_api_data_bulk(
+                [[str(after - i * 60_000), *"111111"] for i in range(1, 101)]
+            )
+
+        monkeypatch.setattr(
+            client, "get_candlesticks_history", get_candlesticks_history
+        )
+        start, end = 1_000 * 60_000, 1_250 * 60_000
+        candlesticks = asyncio.run(
+            client.get_candlesticks_history_range("BTC-USDT", start, end)
+        )
+        assert [call["after"] for call in calls] == [
+            end,
+            end - 100 * 60_000,
+            end - 200 * 60_000,
+        ]
+        assert isinstance(candlesticks, CandleStickBatch)
+        timestamps = candlesticks.timestamps.view("int64").tolist()
+        assert timestamps == list(range(end - 60_000, start - 1, -60_000))
+
+    def test_get_candlesticks_history_range_variable_bar(self):
+        with pytest.raises(ValueError):
+            asyncio.run(
+                AsyncOkexClient().get_candlesticks_history_range(
+                    "BTC-USDT", 0, 1, candle_size="1M"
+                )
+            )
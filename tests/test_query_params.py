@@ -13,11 +13,48 @@ class TestQueryParams:
         query_params = QueryParams(limit=5)
         assert query_params["limit"] == "5"
 
-        with pytest.raises(AssertionError, match="must be an integer"):
+        with pytest.raises(TypeError, match="must be an integer"):
             QueryParams(limit="5")
 
-        with pytest.raises(AssertionError, match="must be an integer"):
+        with pytest.raises(TypeError, match="must be an integer"):
             QueryParams(limit=5.5)
 
-        with pytest.raises(AssertionError, match="must be greater than 0"):
+        with pytest.raises(TypeError, match="must be an integer"):
+            QueryParams(limit=True)
+
+        with pytest.raises(ValueError, match="must be greater than 0"):
             QueryParams(limit=0)
+
+    def test_sz(self):
+        assert QueryParams(sz=5)["sz"] == 5
+
+        with pytest.raises(TypeError, match="must be an integer"):
+            QueryParams(sz="5")
+
+        with pytest.raises(ValueError, match="must be greater than 0"):
+            QueryParams(sz=-1)
+
+    def test_bar(self):
+        assert QueryParams(bar="1H")["bar"] == "1H"
+
+        with pytest.raises(ValueError, match="not a valid candle size"):
+            QueryParams(bar="1h")
+
+    def test_unsupported_param(self):
+        with pytest.raises(KeyError, match="does not support"):
+            QueryParams(foo="bar")
+
+        # dict methods are not parameters
+        with pytest.raises(KeyError, match="does not support"):
+            QueryParams(items="bar")
+
+    @pytest.mark.parametrize("key", ["after", "before"])
+    def test_timestamp(self, key):
+        assert QueryParams(**{key: "1622301480000"})[key] == 1622301480000
+        assert QueryParams(**{key: 0})[key] == 0
+
+        with pytest.raises(ValueError, match="not a valid timestamp"):
+            QueryParams(**{key: -1})
+
+        with pytest.raises(ValueError, match="not a valid timestamp"):
+            QueryParams(**{key: 32_503_680_000_001})
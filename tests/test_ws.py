@@ -5,8 +5,76 @@
 
 
 import asyncio
+import json
+import ssl
 from datetime import datetime
 
+import pytest
+from client import OkexWebsocketsApi, OkexWebsocketsClient
+from client.api_models import Trade
+from client import ws
+from client._ssl import get_ssl_context
+
+TRADE = {
+    "instId": "BTC-USDT",
+    "tradeId": "130639474",
+    "px": "42219.9",
+    "sz": "0.12060306",
+    "side": "buy",
+    "ts": "1630048897897",
+}
+
+
+def client_hello(context):
+    """Get the ClientHello a TLS context sends, to inspect its ALPN offer."""
+    outgoing = ssl.MemoryBIO()
+    tls = context.wrap_bio(ssl.MemoryBIO(), outgoing, server_hostname="okex.com")
+    with pytest.raises(ssl.SSLWantReadError):
+        tls.do_handshake()
+    return outgoing.read()
+
+
+class FakeSocket:
+    """Stands in for a websockets connection, replaying canned messages."""
+
+    def __init__(self, messages):
+        self.sent = []
+        self.messages = list(messages)
+        self.closed = False
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    async def recv(self):
+        return self.messages.pop(0)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.messages:
+            raise StopAsyncIteration
+        return self.messages.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_socket(monkeypatch):
+    subscribed = {
+        "event": "subscribe",
+        "arg": {"channel": "trades", "instId": "BTC-USDT"},
+    }
+    trade = {"arg": subscribed["arg"], "data": [TRADE]}
+    socket = FakeSocket([json.dumps(subscribed), json.dumps(trade)])
+
+    async def connect(self, visibility):
+        return socket
+
+    monkeypatch.setattr(OkexWebsocketsApi, "connect", connect)
+    return socket
+
 
 class TestOkexWebSocketsApi:
     def test_trades(self, ws_api):
@@ -21,3 +89,95 @@ class TestOkexWebSocketsApi:
                 break
 
         asyncio.run(test())
+
+
+class TestOkexWebSocketsApiOffline:
+    def test_trades(self, fake_socket):
+        async def test():
+            return [trade async for trade in OkexWebsocketsApi().trades("BTC-USDT")]
+
+        assert asyncio.run(test()) == [TRADE]
+        assert json.loads(fake_socket.sent[0]) == {
+            "op": "subscribe",
+            "args": [{"channel": "trades", "instId": "BTC-USDT"}],
+        }
+        assert fake_socket.closed
+
+    def test_trades_bypass_parsing(self, fake_socket):
+        frame = fake_socket.messages[1]
+
+        async def test():
+            api = OkexWebsocketsApi()
+            return [msg async for msg in api.trades("BTC-USDT", bypass_parsing=True)]
+
+        assert asyncio.run(test()) == [frame]
+
+    def test_connect(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            ws.websockets, "connect", lambda uri, **kwargs: calls.append((uri, kwargs))
+        )
+        OkexWebsocketsApi().connect("public")
+        [(uri, kwargs)] = calls
+        assert uri == "wss://ws.okex.com:8443/ws/v5/public"
+        assert kwargs["max_queue"] == ws.MAX_QUEUE
+        assert kwargs["compression"] is None
+        assert kwargs["ssl"] is get_ssl_context()
+
+        OkexWebsocketsApi(compression="deflate").connect("public")
+        assert calls[1][1]["compression"] == "deflate"
+
+    def test_ssl_context_offers_http1_only(self):
+        # httpcore sets this on the context httpx is given on every connect
+        get_ssl_context(http2=True).set_alpn_protocols(["http/1.1", "h2"])
+        hello = client_hello(get_ssl_context())
+        assert b"\x08http/1.1" in hello
+        assert b"\x02h2" not in hello
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"instId": "BTC-USDT"},
+            {"instId": 'BTC"USDT'},
+            {"instId": "BTC-USDT", "instType": "SPOT"},
+            {"instType": "SPOT"},
+            {"instIds": ["BTC-USDT", "ETH-USDT"]},
+        ],
+    )
+    def test_get_subscribe_request(self, kwargs):
+        request = OkexWebsocketsApi.get_subscribe_request("trades", **kwargs)
+        assert json.loads(request) == {
+            "op": "subscribe",
+            "args": [{"channel": "trades", **kwargs}],
+        }
+        assert " " not in request
+
+    def test_get_subscribe_request_equal_values(self):
+        # 1, True and 1.0 compare equal but must not share a cached request
+        for value in (1, True, 1.0, "1"):
+            request = OkexWebsocketsApi.get_subscribe_request("tickers", x=value)
+            assert request == json.dumps(
+                {"op": "subscribe", "args": [{"channel": "tickers", "x": value}]},
+                separators=(",", ":"),
+            )
+
+    def test_run_trades(self, fake_socket):
+        trades = []
+        asyncio.run(OkexWebsocketsApi().run_trades("BTC-USDT", trades.append))
+        assert trades == [TRADE]
+        assert fake_socket.closed
+
+    def test_client_run_trades(self, fake_socket):
+        trades = []
+        asyncio.run(OkexWebsocketsClient().run_trades("BTC-USDT", trades.append))
+        assert trades == [Trade.from_api_data(TRADE)]
+
+    def test_client_run_trades_bypass_parsing(self, fake_socket):
+        frame = fake_socket.messages[1]
+        messages = []
+        asyncio.run(
+            OkexWebsocketsClient().run_trades(
+                "BTC-USDT", messages.append, bypass_parsing=True
+            )
+        )
+        assert messages == [frame]